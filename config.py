@@ -4,6 +4,12 @@ Configuration file for Instagram Bot
 Contains all configurable parameters, paths, and API settings
 """
 
+import functools
+import json
+import os
+import sys
+import types
+
 ###################
 ## TIME AND DELAY SETTINGS
 ###################
@@ -14,6 +20,13 @@ MAX_DELAY_MINUTES = 300
 SHORT_DELAY_MIN_MINUTES = 1
 SHORT_DELAY_MAX_MINUTES = 3
 
+# Delay values precomputed in seconds so sleep/scheduling call sites
+# don't redo the minutes-to-seconds arithmetic every cycle
+MIN_DELAY_SECONDS = MIN_DELAY_MINUTES * SECONDS_IN_A_MINUTE
+MAX_DELAY_SECONDS = MAX_DELAY_MINUTES * SECONDS_IN_A_MINUTE
+SHORT_DELAY_MIN_SECONDS = SHORT_DELAY_MIN_MINUTES * SECONDS_IN_A_MINUTE
+SHORT_DELAY_MAX_SECONDS = SHORT_DELAY_MAX_MINUTES * SECONDS_IN_A_MINUTE
+
 ###################
 ## FILE AND DIRECTORY PATHS
 ###################
@@ -22,29 +35,98 @@ LOCAL_DIRECTORY_PATH = "c:\\src\\python\\bdfr\\output\\to_ig\\"
 HASHTAGS_FILE_PATH = "hashtags.txt"
 TOKEN_FILE_PATH = "instagram_token.json"
 
+def load_token(path=TOKEN_FILE_PATH):
+    """
+    Read the token JSON file, re-parsing only when it changes on disk
+
+    The parsed contents are cached keyed by (path, mtime), so repeated
+    token lookups within one run cost a single os.stat() instead of a
+    full open + json.load; saving a refreshed token bumps the mtime and
+    invalidates the cache automatically.
+    """
+    stat = os.stat(path)
+    return _load_token_cached(path, stat.st_mtime_ns)
+
+@functools.lru_cache(maxsize=1)
+def _load_token_cached(path, mtime_ns):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+_HASHTAGS = None
+
+def get_hashtags():
+    """
+    Return the hashtags from HASHTAGS_FILE_PATH as an immutable tuple
+
+    The file is parsed once on first access and kept in memory for the
+    rest of the run, so per-post caption building samples from the cached
+    tuple instead of re-reading and re-splitting the file each time.
+    Duplicate lines are dropped (first occurrence wins) so random.sample
+    can't pick the same tag twice.
+    """
+    global _HASHTAGS
+    if _HASHTAGS is None:
+        try:
+            with open(HASHTAGS_FILE_PATH, 'r', encoding='utf-8') as f:
+                seen = set()
+                tags = []
+                for line in f:
+                    tag = line.strip()
+                    if tag.startswith('#') and tag not in seen:
+                        seen.add(tag)
+                        tags.append(tag)
+                _HASHTAGS = tuple(tags)
+        except OSError:
+            _HASHTAGS = ()
+    return _HASHTAGS
+
 ###################
 ## SFTP SERVER CONFIGURATION
 ###################
 
 # SFTP settings moved to config_security.py for better security
 
+# Write-chunk size for SFTP uploads; paramiko's default 32 KB requests
+# leave a WAN link idle between round-trips on large videos
+SFTP_WRITE_CHUNK_BYTES = 1024 * 1024  # 1 MB
+
 ###################
 ## FACEBOOK/INSTAGRAM API CONFIGURATION
 ###################
 
 # Non-sensitive API settings (sensitive credentials are in config_security.py)
 GRAPH_API_VERSION = 'v18.0'
-GRAPH_URL = f'https://graph.facebook.com/{GRAPH_API_VERSION}/'
+GRAPH_URL = sys.intern(f'https://graph.facebook.com/{GRAPH_API_VERSION}/')
+
+# Endpoint URLs are constant per account, so memoize them: the API-call
+# hot path does a cache lookup instead of building a fresh string
+
+@functools.lru_cache(maxsize=8)
+def media_endpoint(ig_account_id):
+    """Return the media-container endpoint URL for an account"""
+    return f'{GRAPH_URL}{ig_account_id}/media'
+
+@functools.lru_cache(maxsize=8)
+def media_publish_endpoint(ig_account_id):
+    """Return the media-publish endpoint URL for an account"""
+    return f'{GRAPH_URL}{ig_account_id}/media_publish'
 
 ###################
 ## MEDIA FILE SETTINGS
 ###################
 
-VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
+# Stored as a frozenset (all lowercase) so extension checks are O(1) hash
+# lookups; callers should lower-case the extension before testing membership
+VIDEO_EXTENSIONS = frozenset(('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm'))
 MAX_IMAGE_SIZE_MB = 8
 MAX_VIDEO_SIZE_MB = 100
 MB_TO_BYTES = 1024 * 1024
 
+# Size limits precomputed in bytes so validation is a single integer
+# compare; keep the _MB constants for human-readable log output
+MAX_IMAGE_SIZE_BYTES = MAX_IMAGE_SIZE_MB * MB_TO_BYTES
+MAX_VIDEO_SIZE_BYTES = MAX_VIDEO_SIZE_MB * MB_TO_BYTES
+
 ###################
 ## TOKEN MANAGEMENT SETTINGS
 ###################
@@ -52,6 +134,14 @@ MB_TO_BYTES = 1024 * 1024
 TOKEN_EXPIRY_WARNING_DAYS = 7
 LONG_LIVED_TOKEN_DURATION_DAYS = 60
 
+###################
+## POSTING SETTINGS
+###################
+
+# How many files to post per wakeup; 1 keeps the original one-post-per-
+# cycle cadence, higher values are processed concurrently
+POSTS_PER_CYCLE = 1
+
 ###################
 ## HASHTAG SETTINGS
 ###################
@@ -86,7 +176,8 @@ DEBUG_NETWORK_OPERATIONS = True
 DEBUG_TOKEN_MANAGEMENT = True
 
 # PowerShell color codes for debug messages
-DEBUG_COLORS = {
+# Wrapped in a read-only view so log call sites can't mutate the mapping
+DEBUG_COLORS = types.MappingProxyType({
     'general': '\033[37m',      # White
     'file_ops': '\033[36m',     # Cyan
     'api': '\033[32m',          # Green
@@ -98,11 +189,28 @@ DEBUG_COLORS = {
     'warning': '\033[93m',      # Bright Yellow
     'info': '\033[96m',         # Bright Cyan
     'reset': '\033[0m'          # Reset to default
-}
+})
 
 # Enable/disable colored output
 DEBUG_USE_COLORS = True
 
+# Color/reset pairs precomputed at import so colorizing a message costs
+# one dict lookup instead of three per log line
+_RESET_COLOR = DEBUG_COLORS['reset']
+DEBUG_WRAP = {category: (color, _RESET_COLOR) for category, color in DEBUG_COLORS.items()}
+
+if DEBUG_USE_COLORS:
+    def colorize(category, message):
+        """Wrap a message in the ANSI color for its category"""
+        prefix, reset = DEBUG_WRAP.get(category, DEBUG_WRAP['general'])
+        return f"{prefix}{message}{reset}"
+else:
+    # Colors disabled: bind a pass-through once so log call sites never
+    # re-check DEBUG_USE_COLORS
+    def colorize(category, message):
+        """Return the message unchanged (colors disabled)"""
+        return message
+
 ###################
 ## API AND RESPONSE SETTINGS
 ###################
@@ -118,4 +226,26 @@ TOKEN_PREVIEW_LENGTH = 20
 
 # Sleep intervals (seconds)
 WAIT_CHECK_INTERVAL_SECONDS = 60  # How often to check if wait time is complete
-TERMINAL_CLEAR_SPACES = 80  # Spaces to clear terminal line
\ No newline at end of file
+TERMINAL_CLEAR_SPACES = 80  # Spaces to clear terminal line
+
+###################
+## LAZY SECURITY SETTINGS (PEP 562)
+###################
+
+# Credential settings that live in config_security.py; resolved on first
+# access so scripts that only need the cheap constants above never import
+# the security module at all
+_SECURITY_SETTINGS = frozenset((
+    'SFTP_SERVER', 'SFTP_USER', 'SFTP_PASS', 'SFTP_REMOTE_DIR_PATH',
+    'WEB_DIR_PATH', 'APP_ID', 'APP_SECRET', 'IG_ACCOUNT_ID',
+))
+
+def __getattr__(name):
+    """Lazily load credential settings from config_security on first access"""
+    if name in _SECURITY_SETTINGS:
+        import config_security
+        value = getattr(config_security, name)
+        # Cache into module globals so subsequent accesses skip this hook
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
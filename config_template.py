@@ -1,24 +0,0 @@
-#!/usr/bin/env python3
-"""
-Template configuration file for Instagram Bot
-Copy this to config_local.py and fill in your actual values
-"""
-
-###################
-## SFTP SERVER CONFIGURATION
-###################
-
-SFTP_SERVER = "your-sftp-server.com"
-SFTP_USER = "your-username"
-SFTP_PASS = "your-password"
-SFTP_REMOTE_DIR_PATH = '/path/to/upload/directory/'
-WEB_DIR_PATH = "https://your-domain.com/path/to/files/"
-
-###################
-## FACEBOOK/INSTAGRAM API CONFIGURATION
-###################
-
-# IMPORTANT: Replace these with your actual values
-APP_ID = "your-app-id-here"
-APP_SECRET = "your-app-secret-here"
-IG_ACCOUNT_ID = "your-ig-account-id-here"
\ No newline at end of file
@@ -6,13 +6,27 @@ Automatically posts images and videos from local directory to Instagram
 
 import time
 import random
+import functools
 import os
+import socket
 import requests
+import paramiko
 import pysftp
 import re
 import urllib.parse
+import atexit
 import json
+import logging
+import queue
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Import all configuration from config.py
 from config import *
@@ -23,11 +37,52 @@ try:
 except ImportError:
     print("WARNING: config_security.py not found. Please create it with your API credentials.")
     print("See config_security.py.example for template.")
+    _MEDIA_URL = _PUBLISH_URL = None
+else:
+    # The account id never changes within a run, so resolve the two Graph
+    # endpoints once at import instead of per API call
+    _MEDIA_URL = media_endpoint(IG_ACCOUNT_ID)
+    _PUBLISH_URL = media_publish_endpoint(IG_ACCOUNT_ID)
+
+# Shared HTTP session: keep-alive + connection pooling means the Graph API
+# calls in one cycle reuse a single TCP/TLS connection instead of paying a
+# fresh handshake per request; transient 5xx responses are retried by the
+# adapter with backoff
+_SESSION = requests.Session()
+_SESSION.headers['Accept-Encoding'] = 'gzip'
+_http_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504)),
+)
+_SESSION.mount('https://', _http_adapter)
+_SESSION.mount('http://', _http_adapter)
+
+# Category-specific debug flags, built once at import instead of per call
+_CATEGORY_FLAGS = {
+    'file_ops': DEBUG_FILE_OPERATIONS,
+    'api': DEBUG_API_CALLS,
+    'caption': DEBUG_CAPTION_GENERATION,
+    'network': DEBUG_NETWORK_OPERATIONS,
+    'token': DEBUG_TOKEN_MANAGEMENT,
+    'general': True  # General messages always allowed if verbosity permits
+}
+
+# Log records are handed to a listener thread through a queue, so a log
+# call on the hot path costs one queue put instead of a blocking
+# write-and-flush to stdout; the listener thread does the terminal I/O
+_LOG = logging.getLogger("instagram_bot")
+_LOG.setLevel(logging.DEBUG)
+_log_queue = queue.SimpleQueue()
+_LOG.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 def debug_print(message, category="general", verbosity_level=1, message_type="info"):
     """
     Print color-coded debug messages based on configuration settings
-    
+
     Args:
         message (str): The debug message to print
         category (str): Category of debug message (file_ops, api, caption, network, token, general)
@@ -37,41 +92,25 @@ def debug_print(message, category="general", verbosity_level=1, message_type="in
     # Check if overall verbosity level allows this message
     if DEBUG_VERBOSITY < verbosity_level:
         return
-    
+
     # Check category-specific debug flags
-    category_flags = {
-        'file_ops': DEBUG_FILE_OPERATIONS,
-        'api': DEBUG_API_CALLS, 
-        'caption': DEBUG_CAPTION_GENERATION,
-        'network': DEBUG_NETWORK_OPERATIONS,
-        'token': DEBUG_TOKEN_MANAGEMENT,
-        'general': True  # General messages always allowed if verbosity permits
-    }
-    
-    if category in category_flags and not category_flags[category]:
+    if not _CATEGORY_FLAGS.get(category, True):
         return
-    
-    # Get colors for category and message type
-    if DEBUG_USE_COLORS:
-        category_color = DEBUG_COLORS.get(category, DEBUG_COLORS['general'])
-        type_color = DEBUG_COLORS.get(message_type, DEBUG_COLORS['info'])
-        reset_color = DEBUG_COLORS['reset']
-    else:
-        category_color = type_color = reset_color = ''
-    
+
     # Add timestamp and category prefix
     timestamp = datetime.now().strftime('%H:%M:%S')
     category_prefix = f"[{category.upper()}]" if category != "general" else ""
-    
-    # Print with colors
+
+    # Hand the colorized line to the queue listener (colorize is pre-bound
+    # in config, so there is no per-call DEBUG_USE_COLORS branch here)
     if message_type == "error":
-        print(f"{type_color}{timestamp} {category_prefix} ERROR: {message}{reset_color}")
+        _LOG.error(colorize(message_type, f"{timestamp} {category_prefix} ERROR: {message}"))
     elif message_type == "warning":
-        print(f"{type_color}{timestamp} {category_prefix} WARNING: {message}{reset_color}")
+        _LOG.warning(colorize(message_type, f"{timestamp} {category_prefix} WARNING: {message}"))
     elif message_type == "success":
-        print(f"{type_color}{timestamp} {category_prefix} SUCCESS: {message}{reset_color}")
+        _LOG.info(colorize(message_type, f"{timestamp} {category_prefix} SUCCESS: {message}"))
     else:
-        print(f"{category_color}{timestamp} {category_prefix} DEBUG: {message}{reset_color}")
+        _LOG.info(colorize(category, f"{timestamp} {category_prefix} DEBUG: {message}"))
 
 # Convenience functions for common message types
 def debug_info(message, category="general", verbosity_level=1):
@@ -90,6 +129,14 @@ def debug_error(message, category="general", verbosity_level=1):
     """Print an error debug message"""
     debug_print(message, category, verbosity_level, "error")
 
+# In silent mode every emitter is rebound to a no-op at import, so long
+# runs pay a bare function call per suppressed message instead of the
+# verbosity/category/color checks above
+if DEBUG_VERBOSITY == 0:
+    def _debug_noop(message, category="general", verbosity_level=1, message_type="info"):
+        pass
+    debug_print = debug_info = debug_success = debug_warning = debug_error = _debug_noop
+
 ###################
 ## TOKEN MANAGEMENT CLASS
 ###################
@@ -107,18 +154,20 @@ class InstagramTokenManager:
             self.load_token_from_file()
         elif initial_token:
             self.current_token = initial_token
-            self.get_token_info()
+            # Trust the provided token instead of validating it over the
+            # network during construction; long-lived tokens last 60 days
+            # and an invalid one surfaces on the first API call anyway
+            self.token_expires_at = datetime.now() + timedelta(days=LONG_LIVED_TOKEN_DURATION_DAYS)
             self.save_token_to_file()
     
     def load_token_from_file(self):
         """Load token from file"""
         try:
-            with open(self.token_file, 'r') as f:
-                data = json.load(f)
-                self.current_token = data.get('access_token')
-                expires_str = data.get('expires_at')
-                if expires_str:
-                    self.token_expires_at = datetime.fromisoformat(expires_str)
+            data = load_token(self.token_file)
+            self.current_token = data.get('access_token')
+            expires_str = data.get('expires_at')
+            if expires_str:
+                self.token_expires_at = datetime.fromisoformat(expires_str)
             debug_print(f"Loaded token from file, expires at: {self.token_expires_at}", "token", 1, "success")
         except Exception as e:
             debug_print(f"Could not load token from file: {e}", "token", 1, "error")
@@ -147,7 +196,7 @@ class InstagramTokenManager:
             url = f"{GRAPH_URL}me"
             params = {'access_token': self.current_token}
             
-            response = requests.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+            response = _SESSION.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
             debug_print(f"Token validation response: {response.status_code}", "api", 2)
             
             if response.status_code == HTTP_SUCCESS_CODE:
@@ -175,7 +224,7 @@ class InstagramTokenManager:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+            response = _SESSION.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
             debug_print(f"Exchange response status: {response.status_code}", "api", 2)
             
             if response.status_code == HTTP_SUCCESS_CODE:
@@ -226,34 +275,51 @@ class InstagramTokenManager:
 ## UTILITY FUNCTIONS
 ###################
 
+def retry_with_backoff(operation, attempts=3, base_delay_seconds=1.0):
+    """
+    Run operation(), retrying transient network failures with exponential
+    backoff (1s, 2s, 4s by default) before giving up
+
+    A dropped connection during upload or post otherwise wastes the whole
+    scheduling slot, since main() skips to the next cycle on failure.
+    """
+    for attempt in range(attempts):
+        try:
+            return operation()
+        except (requests.RequestException, paramiko.SSHException, OSError) as e:
+            if attempt == attempts - 1:
+                raise
+            delay = base_delay_seconds * (2 ** attempt)
+            debug_print(f"Transient failure ({e}); retrying in {delay:.0f}s", "network", 1, "warning")
+            time.sleep(delay)
+
+# Filename-cleaning patterns compiled once at import instead of going
+# through the re module cache on every upload
+_RE_NONWORD = re.compile(r'[^\w.-]')
+_RE_MULTI_UNDERSCORE = re.compile(r'_+')
+_RE_NUMERIC_SUFFIX = re.compile(r'_\d+$')
+_RE_WORD_SUFFIX = re.compile(r'_(copy|final|new|old|backup)$', re.IGNORECASE)
+
 def is_video_file(file_name):
     """Check if file is a video based on extension"""
-    file_extension = file_name[file_name.rfind('.'):]
-    return file_extension.lower() in VIDEO_EXTENSIONS
+    return os.path.splitext(file_name)[1].lower() in VIDEO_EXTENSIONS
 
-def sanitize_filename(filename):
+def sanitize_filename(name, ext):
     """
-    Sanitize filename by removing special characters and leading/trailing spaces
+    Sanitize a pre-split filename (name, extension) by removing special
+    characters and leading/trailing spaces
     """
-    print(f"DEBUG: Original filename: '{filename}'")
-    
-    # Remove leading and trailing whitespace
-    filename = filename.strip()
-    print(f"DEBUG: After strip: '{filename}'")
-    
-    # Split filename and extension
-    name, ext = os.path.splitext(filename)
-    print(f"DEBUG: Name: '{name}', Extension: '{ext}'")
-    
+    debug_print(f"Name: '{name}', Extension: '{ext}'", "file_ops", 2)
+
     # Remove leading/trailing spaces from name part
     name = name.strip()
-    
+
     # Replace spaces and special characters with underscores
     # Keep only alphanumeric, dots, hyphens, and underscores
-    sanitized_name = re.sub(r'[^\w\.-]', '_', name)
-    
+    sanitized_name = _RE_NONWORD.sub('_', name)
+
     # Remove multiple consecutive underscores
-    sanitized_name = re.sub(r'_+', '_', sanitized_name)
+    sanitized_name = _RE_MULTI_UNDERSCORE.sub('_', sanitized_name)
     
     # Remove leading/trailing underscores
     sanitized_name = sanitized_name.strip('_')
@@ -261,35 +327,41 @@ def sanitize_filename(filename):
     # Reconstruct filename
     sanitized_filename = sanitized_name + ext.lower()
     
-    print(f"DEBUG: Sanitized filename: '{sanitized_filename}'")
+    debug_print(f"Sanitized filename: '{sanitized_filename}'", "file_ops", 2)
     return sanitized_filename
 
-def validate_media_file(file_path):
+def validate_media_file(file_path, is_video=None):
     """
     Validate media file meets Instagram requirements
+
+    Callers that already classified the file (random_file_info returns
+    the flag) pass is_video to skip re-parsing the extension.
     """
-    print(f"DEBUG: Validating file: {file_path}")
-    
-    if not os.path.exists(file_path):
-        print(f"DEBUG: File does not exist: {file_path}")
+    debug_print(f"Validating file: {file_path}", "file_ops", 2)
+
+    # One stat covers both the existence check and the size lookup
+    try:
+        file_size = os.stat(file_path).st_size
+    except FileNotFoundError:
+        debug_print(f"File does not exist: {file_path}", "file_ops", 1, "warning")
         return False, "File does not exist"
-    
-    file_size = os.path.getsize(file_path)
+
     file_size_mb = file_size / MB_TO_BYTES
-    print(f"DEBUG: File size: {file_size} bytes ({file_size_mb:.2f} MB)")
+    debug_print(f"File size: {file_size} bytes ({file_size_mb:.2f} MB)", "file_ops", 2)
     
-    if is_video_file(file_path):
-        max_size = MAX_VIDEO_SIZE_MB * MB_TO_BYTES
-        if file_size > max_size:
-            print(f"DEBUG: Video file too large: {file_size} bytes")
+    if is_video is None:
+        is_video = is_video_file(file_path)
+
+    if is_video:
+        if file_size > MAX_VIDEO_SIZE_BYTES:
+            debug_print(f"Video file too large: {file_size} bytes", "file_ops", 1, "warning")
             return False, f"Video too large (max {MAX_VIDEO_SIZE_MB}MB)"
-        print(f"DEBUG: Video file size OK")
+        debug_print("Video file size OK", "file_ops", 2)
     else:
-        max_size = MAX_IMAGE_SIZE_MB * MB_TO_BYTES
-        if file_size > max_size:
-            print(f"DEBUG: Image file too large: {file_size} bytes")
+        if file_size > MAX_IMAGE_SIZE_BYTES:
+            debug_print(f"Image file too large: {file_size} bytes", "file_ops", 1, "warning")
             return False, f"Image too large (max {MAX_IMAGE_SIZE_MB}MB)"
-        print(f"DEBUG: Image file size OK")
+        debug_print("Image file size OK", "file_ops", 2)
     
     return True, "Valid"
 
@@ -297,86 +369,142 @@ def test_url_accessibility(url):
     """
     Test if URL is accessible to Instagram
     """
-    print(f"DEBUG: Testing URL accessibility: {url}")
+    debug_print(f"Testing URL accessibility: {url}", "network", 2)
     
     try:
-        response = requests.head(url, timeout=HTTP_TIMEOUT_SECONDS)
-        print(f"DEBUG: HTTP Status Code: {response.status_code}")
+        response = _SESSION.head(url, timeout=HTTP_TIMEOUT_SECONDS)
+        debug_print(f"HTTP Status Code: {response.status_code}", "network", 2)
         #print(f"DEBUG: Response Headers: {dict(response.headers)}")
         
         if response.status_code == HTTP_SUCCESS_CODE:
             content_type = response.headers.get('content-type', 'unknown')
             content_length = response.headers.get('content-length', 'unknown')
-            print(f"DEBUG: Content-Type: {content_type}")
-            print(f"DEBUG: Content-Length: {content_length}")
-            
-            # Additional test with GET request
-            print(f"DEBUG: Testing with GET request...")
-            get_response = requests.get(url, timeout=HTTP_TIMEOUT_SECONDS, stream=True)
-            print(f"DEBUG: GET Status Code: {get_response.status_code}")
-            get_response.close()
-            
+            debug_print(f"Content-Type: {content_type}", "network", 2)
+            debug_print(f"Content-Length: {content_length}", "network", 2)
+
             return True
+        elif response.status_code in (405, 501):
+            # Server doesn't implement HEAD; fall back to a streamed GET
+            # closed before the body is transferred
+            debug_print("HEAD not supported, testing with GET request...", "network", 2)
+            get_response = _SESSION.get(url, timeout=HTTP_TIMEOUT_SECONDS, stream=True)
+            debug_print(f"GET Status Code: {get_response.status_code}", "network", 2)
+            get_response.close()
+
+            return get_response.status_code == HTTP_SUCCESS_CODE
         else:
-            print(f"DEBUG: URL not accessible, status: {response.status_code}")
+            debug_print(f"URL not accessible, status: {response.status_code}", "network", 1, "warning")
             return False
             
     except requests.exceptions.Timeout:
-        print(f"DEBUG: Timeout accessing URL")
+        debug_print("Timeout accessing URL", "network", 1, "warning")
         return False
     except requests.exceptions.RequestException as e:
-        print(f"DEBUG: Error accessing URL: {e}")
+        debug_print(f"Error accessing URL: {e}", "network", 1, "warning")
         return False
 
-def calculate_next_execution_time(min_minutes, max_minutes):
-    """Calculate next execution time as absolute timestamp"""
-    delay_minutes = random.randint(min_minutes, max_minutes)
-    next_execution = datetime.now() + timedelta(minutes=delay_minutes)
-    print(f"DEBUG: Next execution scheduled for: {next_execution.strftime('%Y-%m-%d %H:%M:%S')} ({delay_minutes} minutes from now)")
+# Delay samplers with their second ranges pre-bound at import, so a
+# scheduling decision is one call into random.uniform with no argument
+# lookups or minutes-to-seconds conversion on the way
+_cycle_delay_seconds = functools.partial(random.uniform, MIN_DELAY_SECONDS, MAX_DELAY_SECONDS)
+_short_delay_seconds = functools.partial(random.uniform, SHORT_DELAY_MIN_SECONDS, SHORT_DELAY_MAX_SECONDS)
+
+def calculate_next_execution_time(delay_sampler):
+    """
+    Calculate next execution time as absolute timestamp
+
+    Takes one of the pre-bound delay samplers above; the datetime return
+    keeps the human-readable scheduling output and lines up with
+    wait_until_scheduled_time's deadline math.
+    """
+    delay_seconds = delay_sampler()
+    next_execution = datetime.now() + timedelta(seconds=delay_seconds)
+    debug_print(f"Next execution scheduled for: {next_execution.strftime('%Y-%m-%d %H:%M:%S')} ({delay_seconds / SECONDS_IN_A_MINUTE:.0f} minutes from now)", "general", 1)
     return next_execution
 
+# Set by the SIGTERM handler (and available to any future wake source) so
+# the hours-long inter-cycle wait can be interrupted instead of the process
+# sitting unresponsive in time.sleep until the next cycle
+_shutdown_event = threading.Event()
+
+def _request_shutdown(signum, frame):
+    debug_print("Shutdown requested, stopping after current wait", "general", 1, "warning")
+    _shutdown_event.set()
+
 def wait_until_scheduled_time(scheduled_time, caption):
-    """Wait until scheduled execution time, checking every minute"""
-    while datetime.now() < scheduled_time:
-        remaining = scheduled_time - datetime.now()
-        remaining_minutes = int(remaining.total_seconds() / 60)
-        remaining_seconds = int(remaining.total_seconds() % 60)
-        
-        if remaining_minutes > 0:
-            print(f"{caption} Next execution at {scheduled_time.strftime('%H:%M:%S')} (in {remaining_minutes}m {remaining_seconds}s)", end="\r")
-        else:
-            print(f"{caption} Next execution at {scheduled_time.strftime('%H:%M:%S')} (in {remaining_seconds}s)", end="\r")
-        
-        time.sleep(WAIT_CHECK_INTERVAL_SECONDS)  # Check every minute instead of every second
-    
-    # Clear the line after waiting is done
-    print(" " * TERMINAL_CLEAR_SPACES, end="\r")
+    """
+    Wait until scheduled execution time, waking early on shutdown
 
-def random_file_info(directory_path):
-    """Select random file from directory"""
-    print(f"DEBUG: Looking for files in: {directory_path}")
-    
-    if not os.path.isdir(directory_path):
-        print(f"ERROR: {directory_path} is not a valid directory.")
-        return None, None, None
+    Returns True if the wait ran to completion, False when it was cut
+    short by a shutdown request.
+    """
+    remaining = (scheduled_time - datetime.now()).total_seconds()
+    if remaining <= 0:
+        return not _shutdown_event.is_set()
+
+    # One status line up front, then wait straight to the target instead
+    # of waking every minute just to redraw a countdown; Event.wait blocks
+    # like time.sleep but returns as soon as the event is set
+    remaining_minutes = int(remaining / 60)
+    remaining_seconds = int(remaining % 60)
+    if remaining_minutes > 0:
+        print(f"{caption} Next execution at {scheduled_time.strftime('%H:%M:%S')} (in {remaining_minutes}m {remaining_seconds}s)")
+    else:
+        print(f"{caption} Next execution at {scheduled_time.strftime('%H:%M:%S')} (in {remaining_seconds}s)")
+
+    return not _shutdown_event.wait(remaining)
+
+def random_file_infos(directory_path, count):
+    """
+    Select up to count distinct random files from directory
 
-    files = [f for f in os.listdir(directory_path) if os.path.isfile(os.path.join(directory_path, f))]
-    print(f"DEBUG: Found {len(files)} files in directory")
+    Reservoir-samples the scandir stream: DirEntry.is_file() avoids a
+    stat syscall per file and memory stays O(count) however large the
+    media library grows. Returns a list of (name_without_extension,
+    file_name, full_path, extension, is_video) tuples.
+    """
+    debug_print(f"Looking for files in: {directory_path}", "file_ops", 2)
 
-    if not files:
-        print(f"ERROR: No files found in {directory_path}.")
-        return None, None, None
+    if not os.path.isdir(directory_path):
+        debug_print(f"{directory_path} is not a valid directory.", "file_ops", 1, "error")
+        return []
 
-    selected_file = random.choice(files)
-    print(f"DEBUG: Selected random file: {selected_file}")
+    reservoir = []
+    file_count = 0
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            file_count += 1
+            if len(reservoir) < count:
+                reservoir.append(entry)
+            else:
+                slot = random.randrange(file_count)
+                if slot < count:
+                    reservoir[slot] = entry
+    debug_print(f"Found {file_count} files in directory", "file_ops", 2)
 
-    file_name_without_extension, _ = os.path.splitext(selected_file)
-    print(f"DEBUG: File name without extension: {file_name_without_extension}")
+    if not reservoir:
+        debug_print(f"No files found in {directory_path}.", "file_ops", 1, "error")
+        return []
 
-    full_path = os.path.join(directory_path, selected_file)
-    print(f"DEBUG: Full path: {full_path}")
+    selected = []
+    for entry in reservoir:
+        debug_print(f"Selected random file: {entry.name}", "file_ops", 2)
+        file_name_without_extension, file_extension = os.path.splitext(entry.name)
+        # Decide video vs image once here; validation and the posting
+        # branch both reuse the flag instead of re-parsing the extension
+        is_video = file_extension.lower() in VIDEO_EXTENSIONS
+        selected.append((file_name_without_extension, entry.name, entry.path, file_extension, is_video))
 
-    return file_name_without_extension, selected_file, full_path
+    return selected
+
+def random_file_info(directory_path):
+    """Select one random file from directory (see random_file_infos)"""
+    selected = random_file_infos(directory_path, 1)
+    if not selected:
+        return None, None, None, None, None
+    return selected[0]
 
 def clean_filename_for_caption(filename):
     """
@@ -399,31 +527,36 @@ def clean_filename_for_caption(filename):
         'document_final' -> 'document'
         'normal_filename' -> 'normal_filename' (unchanged)
     """
-    import re
-    
     # Remove numeric suffixes like _1, _2, _3, etc. at the end of filename
     # Pattern explanation: _ followed by one or more digits at end of string
-    cleaned = re.sub(r'_\d+$', '', filename)
-    
+    cleaned = _RE_NUMERIC_SUFFIX.sub('', filename)
+
     # Remove common word suffixes like _copy, _final, _new, _old, _backup
     # Pattern explanation: _ followed by specific words at end of string (case-insensitive)
-    cleaned = re.sub(r'_(copy|final|new|old|backup)$', '', cleaned, flags=re.IGNORECASE)
-    
+    cleaned = _RE_WORD_SUFFIX.sub('', cleaned)
+
     return cleaned
 
 def delete_file(file_path):
     """Delete local file"""
-    print(f"DEBUG: Attempting to delete local file: {file_path}")
+    debug_print(f"Attempting to delete local file: {file_path}", "file_ops", 2)
     try:
         os.remove(file_path)
-        print(f"DEBUG: File '{file_path}' deleted successfully.")
+        debug_print(f"File '{file_path}' deleted successfully.", "file_ops", 2)
     except OSError as e:
-        print(f"ERROR: Error deleting file '{file_path}': {e}")
+        debug_print(f"Error deleting file '{file_path}': {e}", "file_ops", 1, "error")
+
+# Single token manager shared by all API calls; constructing one per call
+# re-read the token file (and sometimes re-validated over the network)
+# four times per image+story cycle
+_token_manager = None
 
 def get_current_access_token():
-    """Get current valid access token"""
-    token_manager = InstagramTokenManager(APP_ID, APP_SECRET)
-    return token_manager.get_valid_token()
+    """Get current valid access token from the shared token manager"""
+    global _token_manager
+    if _token_manager is None:
+        _token_manager = InstagramTokenManager(APP_ID, APP_SECRET)
+    return _token_manager.get_valid_token()
 
 ###################
 ## HASHTAG MANAGER CLASS
@@ -432,27 +565,44 @@ def get_current_access_token():
 class HashtagManager:
     def __init__(self, file_path=HASHTAGS_FILE_PATH):
         self.hashtags = self.load_hashtags(file_path)
+        self._n = len(self.hashtags)
 
     def load_hashtags(self, file_path):
+        # The default hashtag file is parsed once and cached in config,
+        # so every manager (and every post) shares the same tuple
+        if file_path == HASHTAGS_FILE_PATH:
+            hashtags = get_hashtags()
+            debug_print(f"Loaded {len(hashtags)} hashtags from {file_path}", "caption", 2)
+            return hashtags
+
         try:
+            # Stream the file and dedup in order (first occurrence wins)
+            # rather than materializing it through readlines()
             with open(file_path, 'r') as file:
-                hashtags = [line.strip() for line in file.readlines() if line.strip().startswith("#")]
-            print(f"DEBUG: Loaded {len(hashtags)} hashtags from {file_path}")
+                seen = set()
+                tags = []
+                for line in file:
+                    tag = line.strip()
+                    if tag.startswith("#") and tag not in seen:
+                        seen.add(tag)
+                        tags.append(tag)
+            hashtags = tuple(tags)
+            debug_print(f"Loaded {len(hashtags)} hashtags from {file_path}", "caption", 2)
             return hashtags
         except FileNotFoundError:
-            print(f"Error: File '{file_path}' not found.")
-            return []
+            debug_print(f"File '{file_path}' not found.", "caption", 1, "error")
+            return ()
         except Exception as e:
-            print(f"Error reading file: {e}")
-            return []
+            debug_print(f"Error reading file: {e}", "caption", 1, "error")
+            return ()
 
     def get_random_hashtags(self, num_hashtags=DEFAULT_HASHTAG_COUNT):
-        if not self.hashtags:
+        if self._n == 0:
             return ""
-        
-        selected_hashtags = random.sample(self.hashtags, min(num_hashtags, len(self.hashtags)))
+
+        selected_hashtags = random.sample(self.hashtags, min(num_hashtags, self._n))
         hashtags_string = " ".join(selected_hashtags)
-        print(f"DEBUG: Selected hashtags: {hashtags_string}")
+        debug_print(f"Selected hashtags: {hashtags_string}", "caption", 2)
         return hashtags_string
 
 ###################
@@ -461,15 +611,15 @@ class HashtagManager:
 
 def post_video(caption='', video_url=''):
     """Upload video to Instagram as Reels"""
-    print(f"DEBUG: Posting video to Instagram")
-    print(f"DEBUG: Caption: {caption[:100]}..." if len(caption) > 100 else f"DEBUG: Caption: {caption}")
-    print(f"DEBUG: Video URL: {video_url}")
+    debug_print("Posting video to Instagram", "api", 2)
+    debug_print(f"Caption: {caption[:100]}..." if len(caption) > 100 else f"Caption: {caption}", "api", 2)
+    debug_print(f"Video URL: {video_url}", "api", 2)
     
     access_token = get_current_access_token()
     if not access_token:
         return {'error': {'message': 'No valid access token available'}}
     
-    url = GRAPH_URL + IG_ACCOUNT_ID + '/media'
+    url = _MEDIA_URL
     param = {
         'access_token': access_token,
         'caption': caption,
@@ -482,29 +632,29 @@ def post_video(caption='', video_url=''):
     #print(f"DEBUG: Parameters: {param}")
     
     try:
-        response = requests.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS)
-        print(f"DEBUG: Response status code: {response.status_code}")
+        response = retry_with_backoff(lambda: _SESSION.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS))
+        debug_print(f"Response status code: {response.status_code}", "api", 2)
         #print(f"DEBUG: Response headers: {dict(response.headers)}")
         
         response_json = response.json()
-        print(f"DEBUG: Response JSON: {response_json}")
+        debug_print(f"Response JSON: {response_json}", "api", 2)
         
         return response_json
     except Exception as e:
-        print(f"ERROR: Video post request failed: {e}")
+        debug_print(f"Video post request failed: {e}", "api", 1, "error")
         return {'error': {'message': f'Request failed: {e}'}}
 
 def post_image(caption='', image_url=''):
     """Upload image to Instagram"""
-    print(f"DEBUG: Posting image to Instagram")
-    print(f"DEBUG: Caption: {caption[:100]}..." if len(caption) > 100 else f"DEBUG: Caption: {caption}")
-    print(f"DEBUG: Image URL: {image_url}")
+    debug_print("Posting image to Instagram", "api", 2)
+    debug_print(f"Caption: {caption[:100]}..." if len(caption) > 100 else f"Caption: {caption}", "api", 2)
+    debug_print(f"Image URL: {image_url}", "api", 2)
     
     access_token = get_current_access_token()
     if not access_token:
         return {'error': {'message': 'No valid access token available'}}
     
-    url = GRAPH_URL + IG_ACCOUNT_ID + '/media'
+    url = _MEDIA_URL
     param = {
         'access_token': access_token,
         'caption': caption,
@@ -515,29 +665,29 @@ def post_image(caption='', image_url=''):
     #print(f"DEBUG: Parameters: {param}")
     
     try:
-        response = requests.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS)
-        print(f"DEBUG: Response status code: {response.status_code}")
+        response = retry_with_backoff(lambda: _SESSION.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS))
+        debug_print(f"Response status code: {response.status_code}", "api", 2)
         #print(f"DEBUG: Response headers: {dict(response.headers)}")
         
         response_json = response.json()
-        print(f"DEBUG: Response JSON: {response_json}")
+        debug_print(f"Response JSON: {response_json}", "api", 2)
         
         return response_json
     except Exception as e:
-        print(f"ERROR: Image post request failed: {e}")
+        debug_print(f"Image post request failed: {e}", "api", 1, "error")
         return {'error': {'message': f'Request failed: {e}'}}
 
 def post_story(caption='', image_url=''):
     """Upload story to Instagram"""
-    print(f"DEBUG: Posting story to Instagram")
-    print(f"DEBUG: Caption: {caption[:100]}..." if len(caption) > 100 else f"DEBUG: Caption: {caption}")
-    print(f"DEBUG: Image URL: {image_url}")
+    debug_print("Posting story to Instagram", "api", 2)
+    debug_print(f"Caption: {caption[:100]}..." if len(caption) > 100 else f"Caption: {caption}", "api", 2)
+    debug_print(f"Image URL: {image_url}", "api", 2)
     
     access_token = get_current_access_token()
     if not access_token:
         return {'error': {'message': 'No valid access token available'}}
     
-    url = GRAPH_URL + IG_ACCOUNT_ID + '/media'
+    url = _MEDIA_URL
     param = {
         'access_token': access_token,
         'image_url': image_url,
@@ -548,27 +698,27 @@ def post_story(caption='', image_url=''):
     #print(f"DEBUG: Parameters: {param}")
     
     try:
-        response = requests.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS)
-        print(f"DEBUG: Response status code: {response.status_code}")
+        response = retry_with_backoff(lambda: _SESSION.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS))
+        debug_print(f"Response status code: {response.status_code}", "api", 2)
         #print(f"DEBUG: Response headers: {dict(response.headers)}")
         
         response_json = response.json()
-        print(f"DEBUG: Response JSON: {response_json}")
+        debug_print(f"Response JSON: {response_json}", "api", 2)
         
         return response_json
     except Exception as e:
-        print(f"ERROR: Story post request failed: {e}")
+        debug_print(f"Story post request failed: {e}", "api", 1, "error")
         return {'error': {'message': f'Request failed: {e}'}}
 
 def publish_container(creation_id=''):
     """Publish uploaded media container"""
-    print(f"DEBUG: Publishing container with ID: {creation_id}")
+    debug_print(f"Publishing container with ID: {creation_id}", "api", 2)
     
     access_token = get_current_access_token()
     if not access_token:
         return {'error': {'message': 'No valid access token available'}}
     
-    url = GRAPH_URL + IG_ACCOUNT_ID + '/media_publish'
+    url = _PUBLISH_URL
     param = {
         'access_token': access_token,
         'creation_id': creation_id
@@ -578,116 +728,369 @@ def publish_container(creation_id=''):
     #print(f"DEBUG: Publish parameters: {param}")
     
     try:
-        response = requests.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS)
-        print(f"DEBUG: Publish response status: {response.status_code}")
+        response = retry_with_backoff(lambda: _SESSION.post(url, params=param, timeout=HTTP_TIMEOUT_SECONDS))
+        debug_print(f"Publish response status: {response.status_code}", "api", 2)
         
         response_json = response.json()
-        print(f"DEBUG: Publish response JSON: {response_json}")
+        debug_print(f"Publish response JSON: {response_json}", "api", 2)
         
         return response_json
     except Exception as e:
-        print(f"ERROR: Publish request failed: {e}")
+        debug_print(f"Publish request failed: {e}", "api", 1, "error")
         return {'error': {'message': f'Request failed: {e}'}}
 
+def publish_containers(creation_ids):
+    """
+    Publish several uploaded media containers in one batched request
+
+    The Graph API accepts a batch parameter that runs multiple
+    sub-requests inside one HTTP round-trip, so publishing the feed post
+    and the story costs a single request instead of one each. Each
+    sub-request still succeeds or fails on its own. Returns a list of
+    response dicts in the same order as creation_ids.
+    """
+    debug_print(f"Publishing {len(creation_ids)} containers in one batch", "api", 2)
+
+    access_token = get_current_access_token()
+    if not access_token:
+        return [{'error': {'message': 'No valid access token available'}}] * len(creation_ids)
+
+    batch = [
+        {'method': 'POST', 'relative_url': f'{IG_ACCOUNT_ID}/media_publish?creation_id={creation_id}'}
+        for creation_id in creation_ids
+    ]
+    param = {
+        'access_token': access_token,
+        'batch': json.dumps(batch)
+    }
+
+    try:
+        response = retry_with_backoff(lambda: _SESSION.post(GRAPH_URL, params=param, timeout=HTTP_TIMEOUT_SECONDS))
+        debug_print(f"Batch publish response status: {response.status_code}", "api", 2)
+
+        results = []
+        for item in response.json():
+            # Each batch item wraps its sub-request's body as a JSON string;
+            # a null item means the sub-request was not completed
+            if item is None:
+                results.append({'error': {'message': 'Batch sub-request was not completed'}})
+            else:
+                results.append(json.loads(item['body']))
+
+        debug_print(f"Batch publish results: {results}", "api", 2)
+        return results
+    except Exception as e:
+        debug_print(f"Batch publish request failed: {e}", "api", 1, "error")
+        return [{'error': {'message': f'Request failed: {e}'}}] * len(creation_ids)
+
 ###################
 ## SFTP FUNCTIONS
 ###################
 
-def upload_to_sftp(full_file_path):
+# CnOpts reads the user's known_hosts file from disk on construction, so
+# build it once on first connect instead of per reconnection; kept lazy so
+# merely importing this module never touches known_hosts
+@functools.lru_cache(maxsize=1)
+def _sftp_cnopts():
+    cnopts = pysftp.CnOpts()
+    cnopts.hostkeys = None  # Skip host key verification
+    return cnopts
+
+class SftpSession:
+    """
+    Lazily-connected SFTP session reused across upload/delete calls
+
+    Opening a pysftp.Connection runs a full SSH handshake (key exchange,
+    authentication, channel open), so doing it once per put/remove
+    dominates cycle time on small files. This wrapper connects on first
+    use, keeps the connection for later calls, and reconnects once when
+    the link has gone stale.
+    """
+
+    def __init__(self):
+        self._conn = None
+
+    def _connect(self):
+        conn = pysftp.Connection(
+            host=SFTP_SERVER, username=SFTP_USER, password=SFTP_PASS, cnopts=_sftp_cnopts()
+        )
+        conn.chdir(SFTP_REMOTE_DIR_PATH)
+        # Advertise a receive window of several write-chunks so the server
+        # can keep its responses in flight during pipelined transfers
+        conn.sftp_client.get_channel().in_window_size = 4 * SFTP_WRITE_CHUNK_BYTES
+        debug_print(f"Connected to SFTP server: {SFTP_SERVER}, remote directory: {SFTP_REMOTE_DIR_PATH}", "file_ops", 2)
+        return conn
+
+    def _run(self, operation):
+        """Run operation(sftp), reconnecting once if the link went stale"""
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            return operation(self._conn)
+        except (socket.error, EOFError, paramiko.SSHException):
+            debug_print("SFTP connection lost, reconnecting...", "file_ops", 1, "warning")
+            self.close()
+            self._conn = self._connect()
+            return operation(self._conn)
+
+    def put(self, local_path, remote_name):
+        """
+        Upload a local file to the remote directory with pipelined writes
+
+        paramiko's default put() sends 32 KB write requests one at a time,
+        so throughput on WAN links is bounded by round-trip latency.
+        Writing through a pipelined remote handle keeps many requests in
+        flight and uses SFTP_WRITE_CHUNK_BYTES-sized chunks, which makes a
+        large difference on video uploads.
+        """
+        def _pipelined_put(sftp):
+            with open(local_path, 'rb') as local_file:
+                with sftp.sftp_client.open(remote_name, 'wb') as remote_file:
+                    remote_file.set_pipelined(True)
+                    while True:
+                        chunk = local_file.read(SFTP_WRITE_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        remote_file.write(chunk)
+
+        return self._run(_pipelined_put)
+
+    def remove(self, remote_name):
+        """Remove a file from the remote directory"""
+        return self._run(lambda sftp: sftp.remove(remote_name))
+
+    def close(self):
+        """Close the underlying connection (reopened on next use)"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+class SftpPool:
+    """
+    Fixed-size pool of SftpSession objects shared by batch workers
+
+    Batch cycles previously built a throwaway SftpSession per worker per
+    cycle, paying the SSH handshake for each one. The pool hands the same
+    lazily-connected sessions back out every cycle, so a worker only pays
+    the handshake when its session is new or has gone stale.
+    """
+
+    def __init__(self, size):
+        self._sessions = queue.Queue()
+        for _ in range(size):
+            self._sessions.put(SftpSession())
+
+    @contextmanager
+    def acquire(self):
+        """Check a session out of the pool, returning it when done"""
+        session = self._sessions.get()
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def close(self):
+        """Close every pooled session (each reopens on next use)"""
+        while True:
+            try:
+                self._sessions.get_nowait().close()
+            except queue.Empty:
+                break
+
+def upload_to_sftp(sftp_session, full_file_path, base_name, ext):
     """
     Upload file to SFTP with sanitized filename
+    The caller passes the already-split base name and extension, so the
+    path is not re-parsed here
     Returns the sanitized filename used on the server
     """
-    print(f"DEBUG: Starting SFTP upload for: {full_file_path}")
-    
-    original_filename = os.path.basename(full_file_path)
-    print(f"DEBUG: Original filename: {original_filename}")
-    
-    sanitized_filename = sanitize_filename(original_filename)
-    print(f"DEBUG: Sanitized filename: {sanitized_filename}")
-    
-    cnopts = pysftp.CnOpts()
-    cnopts.hostkeys = None  # Skip host key verification
+    debug_print(f"Starting SFTP upload for: {full_file_path}", "file_ops", 2)
+
+    sanitized_filename = sanitize_filename(base_name, ext)
+    debug_print(f"Sanitized filename: {sanitized_filename}", "file_ops", 2)
 
     try:
-        with pysftp.Connection(
-            host=SFTP_SERVER, username=SFTP_USER, password=SFTP_PASS, cnopts=cnopts
-        ) as sftp:
-            print(f"DEBUG: Connected to SFTP server: {SFTP_SERVER}")
-            
-            sftp.chdir(SFTP_REMOTE_DIR_PATH)
-            print(f"DEBUG: Changed to remote directory: {SFTP_REMOTE_DIR_PATH}")
-            
-            dir_listing_before = sftp.listdir()
-            print(f"DEBUG: Files in directory before upload: {len(dir_listing_before)} files")
-            
-            print(f"DEBUG: Uploading {full_file_path} as {sanitized_filename}")
-            sftp.put(full_file_path, sanitized_filename)
-            print(f"DEBUG: Upload completed successfully")
-            
-            dir_listing_after = sftp.listdir()
-            print(f"DEBUG: Files in directory after upload: {len(dir_listing_after)} files")
-            
-            if sanitized_filename in dir_listing_after:
-                print(f"DEBUG: File {sanitized_filename} confirmed on server")
-            else:
-                print(f"DEBUG: WARNING - File {sanitized_filename} not found on server!")
-                
+        debug_print(f"Uploading {full_file_path} as {sanitized_filename}", "file_ops", 2)
+        # A failed transfer raises out of put(), so no directory listings
+        # are needed to verify the upload
+        retry_with_backoff(lambda: sftp_session.put(full_file_path, sanitized_filename))
+        debug_print("Upload completed successfully", "file_ops", 2)
+
         return sanitized_filename
-        
+
     except Exception as e:
-        print(f"DEBUG: SFTP upload error: {e}")
+        debug_print(f"SFTP upload error: {e}", "file_ops", 1, "error")
         raise
 
-def delete_from_sftp(file_name):
+def delete_from_sftp(sftp_session, file_name):
     """Delete file from SFTP server"""
-    print(f"DEBUG: Deleting from SFTP: {file_name}")
-
-    cnopts = pysftp.CnOpts()
-    cnopts.hostkeys = None  # Skip host key verification
+    debug_print(f"Deleting from SFTP: {file_name}", "file_ops", 2)
 
     try:
-        with pysftp.Connection(
-            host=SFTP_SERVER, username=SFTP_USER, password=SFTP_PASS, cnopts=cnopts
-        ) as sftp:
-            print(f"DEBUG: Connected to SFTP for deletion")
-            
-            sftp.chdir(SFTP_REMOTE_DIR_PATH)
-            print(f"DEBUG: Changed to remote directory: {SFTP_REMOTE_DIR_PATH}")
-            
-            dir_listing_before = sftp.listdir()
-            print(f"DEBUG: Files before deletion: {len(dir_listing_before)} files")
-            
-            if file_name in dir_listing_before:
-                sftp.remove(file_name)
-                print(f"DEBUG: File {file_name} deleted successfully")
-                
-                dir_listing_after = sftp.listdir()
-                if file_name not in dir_listing_after:
-                    print(f"DEBUG: File {file_name} confirmed deleted")
-                else:
-                    print(f"DEBUG: WARNING - File {file_name} still exists after deletion!")
-            else:
-                print(f"DEBUG: File {file_name} not found on server, skipping deletion")
-                
+        sftp_session.remove(file_name)
+        debug_print(f"File {file_name} deleted successfully", "file_ops", 2)
+
+    except FileNotFoundError:
+        debug_print(f"File {file_name} not found on server, skipping deletion", "file_ops", 2)
     except Exception as e:
-        print(f"DEBUG: SFTP deletion error: {e}")
+        debug_print(f"SFTP deletion error: {e}", "file_ops", 1, "error")
 
 ###################
 ## MAIN EXECUTION
 ###################
 
+def cleanup_cycle(sftp_session, server_filename, local_path):
+    """
+    Remove a published file from the SFTP server and local disk, then
+    drop the idle connection
+
+    Runs on the cleanup executor so the two network/filesystem deletes
+    overlap the inter-cycle wait instead of sitting on the critical path.
+    """
+    delete_from_sftp(sftp_session, server_filename)
+    delete_file(local_path)
+    sftp_session.close()
+
+def process_file(sftp_session, hashtag_manager, cleanup_executor, file_info):
+    """
+    Run one selected file through the full pipeline: validate, upload to
+    SFTP, post to Instagram, and schedule cleanup
+    Returns True when the file was posted
+    """
+    file_name_without_extension, file_name_with_extension, full_path, file_extension, is_video = file_info
+    debug_print(f"Processing file: {file_name_with_extension}", "file_ops", 1)
+
+    # Validate media file
+    is_valid, validation_message = validate_media_file(full_path, is_video)
+    if not is_valid:
+        debug_print(f"File validation failed: {validation_message}", "file_ops", 1, "error")
+        debug_print("Skipping this file and continuing to next", "file_ops", 1)
+        return False
+
+    debug_print(f"File validation passed: {validation_message}", "file_ops", 2)
+
+    # Upload the file to public server (with sanitized name)
+    debug_print("Starting SFTP upload...", "file_ops", 2)
+    try:
+        sanitized_server_filename = upload_to_sftp(sftp_session, full_path, file_name_without_extension, file_extension)
+        debug_print(f"SFTP upload successful, server filename: {sanitized_server_filename}", "file_ops", 1)
+    except Exception as e:
+        debug_print(f"SFTP upload failed: {e}", "file_ops", 1, "error")
+        return False
+
+    # Construct web URL with sanitized filename
+    web_url = WEB_DIR_PATH + sanitized_server_filename
+    debug_print(f"Constructed web URL: {web_url}", "network", 2)
+
+    # Test URL accessibility
+    debug_print("Testing URL accessibility...", "network", 2)
+    if not test_url_accessibility(web_url):
+        debug_print("URL is not accessible, skipping Instagram post", "network", 1, "error")
+        # Clean up - delete from server
+        delete_from_sftp(sftp_session, sanitized_server_filename)
+        return False
+
+    debug_print("URL accessibility test passed", "network", 2)
+
+    # Prepare caption
+    cleaned_filename = clean_filename_for_caption(file_name_without_extension)
+    caption = cleaned_filename + "\n\n" + hashtag_manager.get_random_hashtags()
+    debug_print(f"Cleaned filename: {cleaned_filename}", "caption", 2)
+    debug_print(f"Prepared caption: {caption[:100]}..." if len(caption) > 100 else f"Prepared caption: {caption}", "caption", 1)
+
+    # Upload to instagram
+    if is_video:
+        debug_print("Processing as video file", "api", 1)
+        res = post_video(caption, web_url)
+        if 'error' in res:
+            debug_print(f"Video upload failed: {res['error']}", "api", 1, "error")
+        else:
+            debug_print("Video upload initiated successfully", "api", 1)
+            short_delay_time = calculate_next_execution_time(_short_delay_seconds)
+            wait_until_scheduled_time(short_delay_time, "Let instagram process the video")
+    else:
+        debug_print("Processing as image file", "api", 1)
+
+        # Post image
+        debug_print("Uploading image to Instagram for post", "api", 1)
+        res = post_image(caption, web_url)
+
+        if 'error' in res:
+            debug_print(f"Image upload failed: {res['error']}", "api", 1, "error")
+        elif "id" not in res:
+            debug_print("No ID returned from image upload, cannot publish", "api", 1, "error")
+        else:
+            debug_print("Image upload successful", "api", 1)
+
+            # Create the story container first, then publish both
+            # containers in one batched Graph request: three round-trips
+            # per image cycle instead of four
+            debug_print("Uploading story to Instagram", "api", 1)
+            story_res = post_story(caption, web_url)
+
+            creation_ids = [res["id"]]
+            if 'error' in story_res:
+                debug_print(f"Story upload failed: {story_res['error']}", "api", 1, "error")
+            elif "id" not in story_res:
+                debug_print("No ID returned from story upload, cannot publish", "api", 1, "error")
+            else:
+                debug_print("Story upload successful", "api", 1)
+                creation_ids.append(story_res["id"])
+
+            debug_print("Publishing post + story to Instagram", "api", 1)
+            publish_results = publish_containers(creation_ids)
+
+            if 'error' in publish_results[0]:
+                debug_print(f"Post publish failed: {publish_results[0]['error']}", "api", 1, "error")
+            else:
+                debug_print("Post published successfully", "api", 1, "success")
+
+            if len(publish_results) > 1:
+                if 'error' in publish_results[1]:
+                    debug_print(f"Story publish failed: {publish_results[1]['error']}", "api", 1, "error")
+                else:
+                    debug_print("Story published successfully", "api", 1, "success")
+
+    # Clean up in the background: the SFTP remove and local delete run
+    # while the scheduler starts the inter-cycle wait, and the session is
+    # closed once they're done
+    debug_print("Starting cleanup...", "file_ops", 2)
+    cleanup_executor.submit(cleanup_cycle, sftp_session, sanitized_server_filename, full_path)
+
+    debug_print("Cycle completed successfully", "general", 1, "success")
+    return True
+
 def main():
     """Main execution function"""
-    print("DEBUG: Starting Instagram Bot")
-    print(f"DEBUG: Configuration loaded:")
-    print(f"  - Local directory: {LOCAL_DIRECTORY_PATH}")
-    print(f"  - Delay range: {MIN_DELAY_MINUTES}-{MAX_DELAY_MINUTES} minutes")
-    print(f"  - Max image size: {MAX_IMAGE_SIZE_MB}MB")
-    print(f"  - Max video size: {MAX_VIDEO_SIZE_MB}MB")
+    debug_print("Starting Instagram Bot", "general", 1)
+    debug_print("Configuration loaded:", "general", 1)
+    debug_print(f"  - Local directory: {LOCAL_DIRECTORY_PATH}", "general", 1)
+    debug_print(f"  - Delay range: {MIN_DELAY_MINUTES}-{MAX_DELAY_MINUTES} minutes", "general", 1)
+    debug_print(f"  - Max image size: {MAX_IMAGE_SIZE_MB}MB", "general", 1)
+    debug_print(f"  - Max video size: {MAX_VIDEO_SIZE_MB}MB", "general", 1)
     
+    # Let SIGTERM (e.g. systemctl stop) cut the inter-cycle wait short so
+    # the bot exits in seconds instead of hours
+    signal.signal(signal.SIGTERM, _request_shutdown)
+
     hashtag_manager = HashtagManager()
-    
+
+    # One SFTP session owned by the main loop: upload and cleanup in every
+    # cycle (including the URL-inaccessible path) share its connection
+    sftp_session = SftpSession()
+
+    # Pool for batch cycles, built lazily on the first multi-file batch so
+    # single-post runs never allocate it
+    sftp_pool = None
+
+    # Single background worker for end-of-cycle cleanup; one worker keeps
+    # the deletes ordered behind each other and behind the shared session
+    cleanup_executor = ThreadPoolExecutor(max_workers=1)
+
+
     # Test token on startup
     test_token = get_current_access_token()
     if not test_token:
@@ -700,130 +1103,65 @@ def main():
         print("   token_manager.exchange_for_long_lived_token('your-short-lived-token')")
         return
     
-    print(f"DEBUG: Valid token available: {test_token[:20]}...")
+    debug_print(f"Valid token available: {test_token[:20]}...", "token", 1, "success")
 
     while True:
-        print("-----------------------------------------------------------------------")
-        print("DEBUG: Starting new cycle")
-        
-        # Get local random file
-        file_name_without_extension, file_name_with_extension, full_path = random_file_info(LOCAL_DIRECTORY_PATH)
+        debug_print("-----------------------------------------------------------------------", "general", 1)
+        debug_print("Starting new cycle", "general", 1)
 
-        if file_name_without_extension and file_name_with_extension and full_path:
-            print(f"DEBUG: Processing file: {file_name_with_extension}")
-            
-            # Validate media file
-            is_valid, validation_message = validate_media_file(full_path)
-            if not is_valid:
-                print(f"ERROR: File validation failed: {validation_message}")
-                print("DEBUG: Skipping this file and continuing to next")
-                continue
-            
-            print(f"DEBUG: File validation passed: {validation_message}")
-            
-            # Upload the file to public server (with sanitized name)
-            print("DEBUG: Starting SFTP upload...")
-            try:
-                sanitized_server_filename = upload_to_sftp(full_path)
-                print(f"DEBUG: SFTP upload successful, server filename: {sanitized_server_filename}")
-            except Exception as e:
-                print(f"ERROR: SFTP upload failed: {e}")
-                continue
-            
-            # Construct web URL with sanitized filename
-            web_url = WEB_DIR_PATH + sanitized_server_filename
-            print(f"DEBUG: Constructed web URL: {web_url}")
-            
-            # Test URL accessibility
-            print("DEBUG: Testing URL accessibility...")
-            if not test_url_accessibility(web_url):
-                print("ERROR: URL is not accessible, skipping Instagram post")
-                # Clean up - delete from server
-                delete_from_sftp(sanitized_server_filename)
-                continue
-            
-            print("DEBUG: URL accessibility test passed")
-            
-            # Prepare caption
-            cleaned_filename = clean_filename_for_caption(file_name_without_extension)
-            caption = cleaned_filename + "\n\n" + hashtag_manager.get_random_hashtags()
-            debug_print(f"Cleaned filename: {cleaned_filename}", "caption", 2)
-            debug_print(f"Prepared caption: {caption[:100]}..." if len(caption) > 100 else f"Prepared caption: {caption}", "caption", 1)
-            
-            # Upload to instagram
-            if is_video_file(file_name_with_extension):
-                print("DEBUG: Processing as video file")
-                res = post_video(caption, web_url)
-                if 'error' in res:
-                    print(f"ERROR: Video upload failed: {res['error']}")
-                else:
-                    print("DEBUG: Video upload initiated successfully")
-                    short_delay_time = calculate_next_execution_time(SHORT_DELAY_MIN_MINUTES, SHORT_DELAY_MAX_MINUTES)
-                    wait_until_scheduled_time(short_delay_time, "Let instagram process the video")
-            else:
-                print("DEBUG: Processing as image file")
-                
-                # Post image
-                print("-- uploading image to instagram for post--") 
-                res = post_image(caption, web_url)
-                
-                if 'error' in res:
-                    print(f"ERROR: Image upload failed: {res['error']}")
-                else:
-                    print("DEBUG: Image upload successful")
-                    
-                    # publish on post to instagram 
-                    if "id" in res:
-                        print("-- publish post to instagram --")    
-                        publish_res = publish_container(res["id"])
-                        
-                        if 'error' in publish_res:
-                            print(f"ERROR: Post publish failed: {publish_res['error']}")
-                        else:
-                            print("DEBUG: Post published successfully")
-
-                            # Upload as story
-                            print("-- uploading image to instagram for story--") 
-                            story_res = post_story(caption, web_url)
-                            
-                            if 'error' in story_res:
-                                print(f"ERROR: Story upload failed: {story_res['error']}")
-                            else:
-                                print("DEBUG: Story upload successful")
-                                
-                                # publish story to instagram 
-                                if "id" in story_res:
-                                    print("-- publish story to instagram --")    
-                                    story_publish_res = publish_container(story_res["id"])
-                                    
-                                    if 'error' in story_publish_res:
-                                        print(f"ERROR: Story publish failed: {story_publish_res['error']}")
-                                    else:
-                                        print("DEBUG: Story published successfully")
-                    else:
-                        print("ERROR: No ID returned from image upload, cannot publish")
-
-            # Clean up - remove from public server
-            print("DEBUG: Starting cleanup...")
-            delete_from_sftp(sanitized_server_filename)
-            
-            # Delete local file
-            print("-- delete local file --")
-            delete_file(full_path)
-            
-            print("DEBUG: Cycle completed successfully")
+        # Get local random file(s)
+        batch = random_file_infos(LOCAL_DIRECTORY_PATH, POSTS_PER_CYCLE)
+
+        if not batch:
+            debug_print("Could not select a file to process", "file_ops", 1, "error")
+        elif len(batch) == 1:
+            process_file(sftp_session, hashtag_manager, cleanup_executor, batch[0])
         else:
-            print("ERROR: Could not select a file to process")
-        
-        # Schedule next cycle
-        print("DEBUG: Scheduling next cycle")
-        next_cycle_time = calculate_next_execution_time(MIN_DELAY_MINUTES, MAX_DELAY_MINUTES)
-        wait_until_scheduled_time(next_cycle_time, "Next cycle at")
-        print("DEBUG: Starting next cycle")
+            # paramiko connections are not thread-safe, so each worker in
+            # the batch checks its own session out of the pool; the Graph
+            # calls all share the pooled HTTP session, which is thread-safe.
+            # Pooled sessions persist across cycles, so only the first batch
+            # pays the SSH handshakes.
+            debug_print(f"Processing batch of {len(batch)} files", "general", 1)
+            if sftp_pool is None:
+                sftp_pool = SftpPool(len(batch))
+
+            def process_pooled(file_info):
+                with sftp_pool.acquire() as session:
+                    return process_file(session, hashtag_manager, cleanup_executor, file_info)
+
+            with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+                futures = [executor.submit(process_pooled, file_info) for file_info in batch]
+                for future in futures:
+                    future.result()
+
+        # Schedule next cycle (cleanup finishes during the hours-long
+        # wait; the SFTP connection is reopened on first use next cycle)
+        debug_print("Scheduling next cycle", "general", 2)
+        next_cycle_time = calculate_next_execution_time(_cycle_delay_seconds)
+        if not wait_until_scheduled_time(next_cycle_time, "Next cycle at"):
+            break
+        debug_print("Starting next cycle", "general", 2)
+
+    # Let the pending background deletes finish before exiting
+    debug_print("Shutting down", "general", 1)
+    cleanup_executor.shutdown(wait=True)
+    sftp_session.close()
+    if sftp_pool is not None:
+        sftp_pool.close()
 
 def setup_token():
     """One-time setup to get long-lived token"""
     print("=== Instagram Bot Token Setup ===")
+
+    # Re-running setup with a healthy token on disk would burn a token
+    # exchange (and Facebook's rate limit) for nothing, so short-circuit
+    existing_manager = InstagramTokenManager(APP_ID, APP_SECRET)
+    if existing_manager.is_token_valid():
+        print(f"✅ A valid long-lived token already exists (expires {existing_manager.token_expires_at}).")
+        print("✅ No exchange needed; you can run the bot normally.")
+        return
+
     print("1. Go to: https://developers.facebook.com/tools/explorer/")
     print("2. Select your app")
     print("3. Get User Access Token with these permissions:")